@@ -30,6 +30,11 @@ DSSMItemDatasetT = tp.TypeVar("DSSMItemDatasetT", bound="DSSMItemDatasetBase")
 DSSMUserDatasetT = tp.TypeVar("DSSMUserDatasetT", bound="DSSMUserDatasetBase")
 
 
+def _row_to_tensor(row: sparse.csr_matrix) -> torch.FloatTensor:
+    # `toarray` always allocates a new array, so tensor can share its memory instead of copying it
+    return torch.from_numpy(row.toarray().ravel().astype(np.float32, copy=False))  # type: ignore
+
+
 class DSSMTrainDatasetBase(TorchDataset[tp.Any]):
     """Base class for DSSM training datasets. Used only for type hinting."""
 
@@ -71,7 +76,7 @@ class DSSMTrainDataset(DSSMTrainDatasetBase):
         self.items = items
         self.users = users
         self.interactions = interactions
-        if not self.interactions.sum(1).all() or (self.interactions < 0).sum(1).any():
+        if not self.interactions.sum(1).all() or (self.interactions.data < 0).any():
             raise ValueError(
                 "Impossible to sample from a row that either contains only negative items"
                 " or contains any negatively signed integers."
@@ -97,15 +102,16 @@ class DSSMTrainDataset(DSSMTrainDatasetBase):
     def __getitem__(
         self, idx: int
     ) -> tp.Tuple[torch.FloatTensor, torch.FloatTensor, torch.FloatTensor, torch.FloatTensor]:
-        interactions_vec = self.interactions[idx].toarray().flatten()
-        probabilities = interactions_vec / interactions_vec.sum()
-        pos_i = np.random.choice(np.arange(self.interactions.shape[1]), p=probabilities)
-        neg_i = np.random.choice(np.arange(self.interactions.shape[1]))
+        # Sample positive directly from the CSR row instead of the dense vector
+        row_start, row_end = self.interactions.indptr[idx], self.interactions.indptr[idx + 1]
+        row_weights = self.interactions.data[row_start:row_end]
+        pos_i = np.random.choice(self.interactions.indices[row_start:row_end], p=row_weights / row_weights.sum())
+        neg_i = np.random.choice(self.interactions.shape[1])
 
-        user_features = torch.FloatTensor(self.users[idx].toarray().flatten())
-        interactions = torch.FloatTensor(interactions_vec)
-        pos = torch.FloatTensor(self.items[pos_i].toarray().flatten())
-        neg = torch.FloatTensor(self.items[neg_i].toarray().flatten())
+        user_features = _row_to_tensor(self.users[idx])
+        interactions = _row_to_tensor(self.interactions[idx])
+        pos = _row_to_tensor(self.items[pos_i])
+        neg = _row_to_tensor(self.items[neg_i])
 
         return user_features, interactions, pos, neg
 
@@ -145,7 +151,7 @@ class DSSMItemDataset(DSSMItemDatasetBase):
         return self.items.shape[0]
 
     def __getitem__(self, idx: int) -> torch.FloatTensor:
-        return torch.FloatTensor(self.items[idx].toarray().flatten())
+        return _row_to_tensor(self.items[idx])
 
 
 class DSSMUserDatasetBase(TorchDataset[tp.Any]):
@@ -208,6 +214,4 @@ class DSSMUserDataset(DSSMUserDatasetBase):
         return self.users.shape[0]
 
     def __getitem__(self, idx: int) -> tp.Tuple[torch.FloatTensor, torch.FloatTensor]:
-        user_features = self.users[idx].toarray().flatten()
-        interactions = self.interactions[idx].toarray().flatten()
-        return torch.FloatTensor(user_features), torch.FloatTensor(interactions)
+        return _row_to_tensor(self.users[idx]), _row_to_tensor(self.interactions[idx])
@@ -167,8 +167,9 @@ class DSSM(LightningModule):
         interactions: torch.Tensor,
     ) -> tp.Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
         anchor = self.user_net(user_features, interactions)
-        pos = self.item_net(item_features_pos)
-        neg = self.item_net(item_features_neg)
+        # Positives and negatives share item network, so propagate them in a single pass
+        items = self.item_net(torch.cat((item_features_pos, item_features_neg), 0))
+        pos, neg = torch.split(items, [item_features_pos.shape[0], item_features_neg.shape[0]])
 
         return anchor, pos, neg
 
@@ -195,22 +196,24 @@ class DSSM(LightningModule):
     def inference_items(self, dataloader: DataLoader[tp.Any]) -> np.ndarray:
         batches = []
         self.eval()
-        for batch in dataloader:
-            item_features = batch
-            with torch.no_grad():
-                v_batch = self.item_net(item_features.to(self.device))
-            batches.append(v_batch)
+        device = self.device
+        with torch.no_grad():
+            for batch in dataloader:
+                item_features = batch
+                v_batch = self.item_net(item_features.to(device))
+                batches.append(v_batch)
         vectors = torch.cat(batches, dim=0).cpu().numpy()
         return vectors
 
     def inference_users(self, dataloader: DataLoader[tp.Any]) -> np.ndarray:
         batches = []
         self.eval()
-        for batch in dataloader:
-            user_features, interactions = batch
-            with torch.no_grad():
-                v_batch = self.user_net(user_features.to(self.device), interactions.to(self.device))
-            batches.append(v_batch)
+        device = self.device
+        with torch.no_grad():
+            for batch in dataloader:
+                user_features, interactions = batch
+                v_batch = self.user_net(user_features.to(device), interactions.to(device))
+                batches.append(v_batch)
         vectors = torch.cat(batches, dim=0).cpu().numpy()
         return vectors
 
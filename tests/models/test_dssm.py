@@ -28,6 +28,8 @@ from rectools.models.vector import ImplicitRanker
 
 from .data import INTERACTIONS
 
+FittedModelFactory = tp.Callable[[tp.Hashable, tp.Callable[[], DSSMModel]], DSSMModel]
+
 
 @pytest.mark.filterwarnings("ignore::pytorch_lightning.utilities.warnings.PossibleUserWarning")
 @pytest.mark.filterwarnings("ignore::UserWarning")
@@ -35,7 +37,7 @@ class TestDSSMModel:
     def setup_method(self) -> None:
         seed_everything(42, workers=True)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def dataset(self) -> Dataset:
         item_features = pd.DataFrame(
             [
@@ -80,6 +82,18 @@ class TestDSSMModel:
         )
         return ds
 
+    @pytest.fixture(scope="class")
+    def fitted_model_factory(self) -> FittedModelFactory:
+        fitted_models: tp.Dict[tp.Hashable, DSSMModel] = {}
+
+        def get_fitted_model(key: tp.Hashable, fit_model: tp.Callable[[], DSSMModel]) -> DSSMModel:
+            # Fit is the most expensive part of the tests, so cases with the same model config share one fit
+            if key not in fitted_models:
+                fitted_models[key] = fit_model()
+            return fitted_models[key]
+
+        return get_fitted_model
+
     @pytest.mark.parametrize(
         "filter_viewed,expected",
         (
@@ -106,32 +120,39 @@ class TestDSSMModel:
         ),
     )
     @pytest.mark.parametrize("default_base_model", (True, False))
-    def test_u2i(self, dataset: Dataset, filter_viewed: bool, expected: pd.DataFrame, default_base_model: bool) -> None:
-        if default_base_model:
-            base_model = None
-        else:
-            base_model = DSSM(
-                n_factors_item=32,
-                n_factors_user=32,
-                dim_input_item=dataset.item_features.get_sparse().shape[1],  # type: ignore
-                dim_input_user=dataset.user_features.get_sparse().shape[1],  # type: ignore
-                dim_interactions=dataset.get_user_item_matrix().shape[1],
+    def test_u2i(
+        self,
+        dataset: Dataset,
+        fitted_model_factory: FittedModelFactory,
+        filter_viewed: bool,
+        expected: pd.DataFrame,
+        default_base_model: bool,
+    ) -> None:
+        def fit_model() -> DSSMModel:
+            if default_base_model:
+                base_model = None
+            else:
+                base_model = DSSM(
+                    n_factors_item=32,
+                    n_factors_user=32,
+                    dim_input_item=dataset.item_features.get_sparse().shape[1],  # type: ignore
+                    dim_input_user=dataset.user_features.get_sparse().shape[1],  # type: ignore
+                    dim_interactions=dataset.get_user_item_matrix().shape[1],
+                )
+            model = DSSMModel(
+                model=base_model,
+                n_factors=32,
+                max_epochs=3,
+                batch_size=4,
+                deterministic=True,
             )
-        model = DSSMModel(
-            model=base_model,
-            n_factors=32,
-            max_epochs=3,
-            batch_size=4,
-            deterministic=True,
-        )
-        model.fit(dataset=dataset, dataset_valid=dataset)
+            return model.fit(dataset=dataset, dataset_valid=dataset)
+
+        model = fitted_model_factory(("u2i", default_base_model), fit_model)
         users = np.array([10, 20, 50])
         actual = model.recommend(users=users, dataset=dataset, k=3, filter_viewed=filter_viewed)
         pd.testing.assert_frame_equal(actual.drop(columns=Columns.Score), expected)
-        pd.testing.assert_frame_equal(
-            actual.sort_values([Columns.User, Columns.Score], ascending=[True, True]).reset_index(drop=True),
-            actual,
-        )
+        assert actual.groupby(Columns.User)[Columns.Score].apply(lambda s: s.is_monotonic_increasing).all()
 
     @pytest.mark.parametrize(
         "filter_viewed,expected",
@@ -158,14 +179,23 @@ class TestDSSMModel:
             ),
         ),
     )
-    def test_with_whitelist(self, dataset: Dataset, filter_viewed: bool, expected: pd.DataFrame) -> None:
-        model = DSSMModel(
-            n_factors=32,
-            max_epochs=3,
-            batch_size=4,
-            deterministic=True,
-        )
-        model.fit(dataset=dataset)
+    def test_with_whitelist(
+        self,
+        dataset: Dataset,
+        fitted_model_factory: FittedModelFactory,
+        filter_viewed: bool,
+        expected: pd.DataFrame,
+    ) -> None:
+        def fit_model() -> DSSMModel:
+            model = DSSMModel(
+                n_factors=32,
+                max_epochs=3,
+                batch_size=4,
+                deterministic=True,
+            )
+            return model.fit(dataset=dataset)
+
+        model = fitted_model_factory("with_whitelist", fit_model)
         users = np.array([10, 50])
         actual = model.recommend(
             users=users,
@@ -175,10 +205,7 @@ class TestDSSMModel:
             items_to_recommend=np.array([17, 13, 11]),
         )
         pd.testing.assert_frame_equal(actual.drop(columns=Columns.Score), expected)
-        pd.testing.assert_frame_equal(
-            actual.sort_values([Columns.User, Columns.Score], ascending=[True, True]).reset_index(drop=True),
-            actual,
-        )
+        assert actual.groupby(Columns.User)[Columns.Score].apply(lambda s: s.is_monotonic_increasing).all()
 
     def test_get_vectors(self, dataset: Dataset) -> None:
         base_model = DSSM(
@@ -276,15 +303,23 @@ class TestDSSMModel:
         ),
     )
     def test_i2i(
-        self, dataset: Dataset, filter_itself: bool, whitelist: tp.Optional[np.ndarray], expected: pd.DataFrame
+        self,
+        dataset: Dataset,
+        fitted_model_factory: FittedModelFactory,
+        filter_itself: bool,
+        whitelist: tp.Optional[np.ndarray],
+        expected: pd.DataFrame,
     ) -> None:
-        model = DSSMModel(
-            n_factors=2,
-            max_epochs=3,
-            batch_size=4,
-            deterministic=True,
-        )
-        model.fit(dataset=dataset, dataset_valid=dataset)
+        def fit_model() -> DSSMModel:
+            model = DSSMModel(
+                n_factors=2,
+                max_epochs=3,
+                batch_size=4,
+                deterministic=True,
+            )
+            return model.fit(dataset=dataset, dataset_valid=dataset)
+
+        model = fitted_model_factory("i2i", fit_model)
         target_items = np.array([11, 12, 16])
         actual = model.recommend_to_items(
             target_items=target_items,
@@ -294,13 +329,10 @@ class TestDSSMModel:
             items_to_recommend=whitelist,
         )
         pd.testing.assert_frame_equal(actual.drop(columns=Columns.Score), expected)
-        pd.testing.assert_frame_equal(
-            actual.sort_values([Columns.TargetItem, Columns.Score], ascending=[True, True]).reset_index(drop=True),
-            actual,
-        )
+        assert actual.groupby(Columns.TargetItem)[Columns.Score].apply(lambda s: s.is_monotonic_increasing).all()
 
     def test_u2i_with_cold_users(self, dataset: Dataset) -> None:
-        model = DSSMModel().fit(dataset)
+        model = DSSMModel(max_epochs=1).fit(dataset)
         with pytest.raises(ValueError, match="doesn't support recommendations for cold users"):
             model.recommend(
                 users=[10, 60],
@@ -310,7 +342,7 @@ class TestDSSMModel:
             )
 
     def test_i2i_with_cold_items(self, dataset: Dataset) -> None:
-        model = DSSMModel().fit(dataset)
+        model = DSSMModel(max_epochs=1).fit(dataset)
         with pytest.raises(ValueError, match="doesn't support recommendations for cold items"):
             model.recommend_to_items(
                 target_items=[11, 18],